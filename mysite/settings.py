@@ -120,4 +120,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # --- НОВАЯ НАСТРОЙКА ---
 LOGIN_REDIRECT_URL = 'polls:index' # Перенаправление после входа
-# --- /НОВАЯ НАСТРОЙКА ---
\ No newline at end of file
+# --- /НОВАЯ НАСТРОЙКА ---
+
+# Загружаем профиль вместе с пользователем при каждом запросе (см. polls/backends.py).
+# Это добавляет LEFT JOIN к polls_userprofile в каждый аутентифицированный запрос, включая админку.
+# ModelBackend оставлен вторым, чтобы сессии, созданные до этой настройки, продолжали работать.
+AUTHENTICATION_BACKENDS = [
+    'polls.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
@@ -0,0 +1,18 @@
+# polls/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+class ProfileModelBackend(ModelBackend):
+    """
+    Стандартный ModelBackend, который загружает пользователя вместе с профилем.
+    AuthenticationMiddleware получает request.user через get_user(), поэтому
+    обращение к user.profile в представлениях и шаблонах не требует отдельного запроса.
+    """
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,33 @@
+# polls/cache.py
+import time
+from django.core.cache import cache
+
+# Кэш списка активных вопросов для главной страницы (одинаков для всех пользователей).
+# Ключ версионируется: любое изменение Question увеличивает версию (см. signals.py),
+# и старая запись просто перестаёт читаться.
+INDEX_QUESTIONS_CACHE_KEY = 'polls:index:questions'
+INDEX_QUESTIONS_VERSION_KEY = 'polls:questions:ver'
+# Короткий таймаут - страховка для случаев, когда версия не меняется: кэш по умолчанию
+# (LocMemCache) свой у каждого процесса, а QuerySet.update() и bulk_create не шлют сигналов
+INDEX_QUESTIONS_CACHE_TIMEOUT = 30 # секунд
+
+def get_questions_version():
+    """
+    Возвращает текущую версию списка вопросов.
+    """
+    version = cache.get(INDEX_QUESTIONS_VERSION_KEY)
+    if version is None:
+        # Ключа версии ещё нет (или он вытеснен): начинаем с уникального значения,
+        # чтобы не прочитать запись, оставшуюся от прежней версии
+        cache.add(INDEX_QUESTIONS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(INDEX_QUESTIONS_VERSION_KEY)
+    return version
+
+def bump_questions_version():
+    """
+    Делает устаревшими все закэшированные списки вопросов.
+    """
+    try:
+        cache.incr(INDEX_QUESTIONS_VERSION_KEY)
+    except ValueError:
+        pass # Ключа версии нет - следующее чтение создаст новую версию
@@ -2,6 +2,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from django.db import transaction
 from .models import UserProfile, Question, Choice
 
 class UserProfileCreationForm(forms.ModelForm):
@@ -26,19 +27,22 @@ class UserRegisterForm(UserCreationForm):
         fields = ["username", "email", "password1", "password2"]
 
     def save(self, commit=True):
-        user = super().save(commit=False)
-        user.email = self.cleaned_data["email"]
-        if commit:
+        """
+        Создаёт пользователя и его профиль в одной транзакции,
+        чтобы не остался пользователь без профиля.
+        Профиль нельзя создать для несохранённого пользователя, поэтому commit=False не поддерживается.
+        """
+        if not commit:
+            raise ValueError("UserRegisterForm.save() не поддерживает commit=False: профиль требует сохранённого пользователя.")
+        with transaction.atomic():
+            user = super().save(commit=False)
+            user.email = self.cleaned_data["email"]
             user.save()
-
-        profile = UserProfile(
-            user=user,
-            name=self.cleaned_data.get("name", ""),
-            avatar=self.cleaned_data["avatar"]
-        )
-        if commit:
-            profile.save()
-
+            UserProfile.objects.create(
+                user=user,
+                name=self.cleaned_data.get("name", ""),
+                avatar=self.cleaned_data["avatar"]
+            )
         return user
 
 class UserUpdateForm(forms.ModelForm):
@@ -66,45 +70,24 @@ class ProfileEditFormSet:
     """
     Объединяет UserUpdateForm и ProfileUpdateForm.
     """
-    def __init__(self, user_data=None, profile_data=None, files=None):
-        self.user_form = UserUpdateForm(user_data, instance=self.get_user_instance())
-        self.profile_form = ProfileUpdateForm(profile_data, files=files, instance=self.get_profile_instance())
-
-    def get_user_instance(self):
-        # Предполагается, что instance будет установлен в представлении
-        # Возвращаем None или вызываем ошибку, если instance не установлен
-        return getattr(self, '_user_instance', None)
-
-    def get_profile_instance(self):
-        # Предполагается, что instance будет установлен в представлении
-        # Возвращаем None или вызываем ошибку, если instance не установлен
-        return getattr(self, '_profile_instance', None)
-
-    def set_instances(self, user_instance, profile_instance):
-        """Устанавливает экземпляры для форм."""
-        self._user_instance = user_instance
-        self._profile_instance = profile_instance
-        # Пересоздаём формы с новыми инстансами
-        self.user_form = UserUpdateForm(
-            instance=self._user_instance,
-            data=self.user_form.data if self.user_form.is_bound else None
-        )
-        self.profile_form = ProfileUpdateForm(
-            instance=self._profile_instance,
-            data=self.profile_form.data if self.profile_form.is_bound else None,
-            files=self.profile_form.files if self.profile_form.is_bound else None
-        )
+    def __init__(self, user_instance, profile_instance, user_data=None, profile_data=None, files=None):
+        self.user_form = UserUpdateForm(user_data, instance=user_instance)
+        self.profile_form = ProfileUpdateForm(profile_data, files=files, instance=profile_instance)
 
     def is_valid(self):
         """Проверяет валидность обеих форм."""
         return self.user_form.is_valid() and self.profile_form.is_valid()
 
     def save(self):
-        """Сохраняет обе формы."""
-        user = self.user_form.save()
+        """
+        Сохраняет обе формы.
+        UPDATE затрагивает только изменённые поля (если ничего не изменилось, запроса нет).
+        """
+        user = self.user_form.save(commit=False)
+        user.save(update_fields=self.user_form.changed_data)
         profile = self.profile_form.save(commit=False)
         profile.user = user # Убедимся, что профиль связан с правильным пользователем
-        profile.save()
+        profile.save(update_fields=self.profile_form.changed_data)
         return user, profile
 
 class QuestionCreateForm(forms.ModelForm):
@@ -116,6 +99,7 @@ class QuestionCreateForm(forms.ModelForm):
     choice1 = forms.CharField(max_length=200, label='Вариант 1', required=False)
     choice2 = forms.CharField(max_length=200, label='Вариант 2', required=False)
     choice3 = forms.CharField(max_length=200, label='Вариант 3', required=False)
+    CHOICE_FIELDS = ('choice1', 'choice2', 'choice3')
 
     class Meta:
         model = Question
@@ -141,10 +125,13 @@ class QuestionCreateForm(forms.ModelForm):
         if commit:
             question.save()
 
-        # Создаем варианты ответа из формы
-        for i in range(1, 4):
-            choice_text = self.cleaned_data.get(f'choice{i}')
-            if choice_text:
-                Choice.objects.create(question=question, choice_text=choice_text)
+        # Создаем варианты ответа из формы одним INSERT
+        choices = [
+            Choice(question=question, choice_text=choice_text)
+            for field in self.CHOICE_FIELDS
+            if (choice_text := self.cleaned_data.get(field))
+        ]
+        if choices:
+            Choice.objects.bulk_create(choices)
 
         return question
\ No newline at end of file
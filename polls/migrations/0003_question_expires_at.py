@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-14 11:00
+
+import datetime
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def fill_expires_at(apps, schema_editor):
+    Question = apps.get_model('polls', 'Question')
+    questions = list(Question.objects.only('pk', 'pub_date', 'lifespan_days'))
+    for question in questions:
+        question.expires_at = question.pub_date + datetime.timedelta(days=question.lifespan_days)
+    Question.objects.bulk_update(questions, ['expires_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0002_alter_question_pub_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='question',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='date published'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='date expires'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_expires_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-14 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0004_vote_polls_vote_questio_db4555_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='short_description',
+            field=models.CharField(default='', help_text='Краткое описание для списка опросов', max_length=500),
+            preserve_default=False,
+        ),
+    ]
@@ -2,6 +2,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.functional import cached_property
 import datetime
 
 class UserProfile(models.Model):
@@ -15,20 +16,35 @@ class UserProfile(models.Model):
 class Question(models.Model):
     question_text = models.CharField(max_length=200) # Можно использовать как полное описание или заголовок
     short_description = models.CharField(max_length=500, help_text="Краткое описание для списка опросов") # Новое поле
-    pub_date = models.DateTimeField('date published', auto_now_add=True)
+    # default вместо auto_now_add: pub_date должен быть известен до INSERT, чтобы посчитать expires_at
+    pub_date = models.DateTimeField('date published', default=timezone.now, editable=False, db_index=True)
     image = models.ImageField(upload_to='question_images/', blank=True, null=True)
     lifespan_days = models.PositiveIntegerField(default=7, help_text="Сколько дней вопрос будет публичным")
+    expires_at = models.DateTimeField('date expires', editable=False, db_index=True) # pub_date + lifespan_days, заполняется в save()
 
+    @cached_property
     def was_published_recently(self):
         return self.pub_date >= timezone.now() - datetime.timedelta(days=1)
 
+    @cached_property
     def is_active(self):
         """
         Проверяет, активен ли вопрос (не истёк ли срок жизни).
         Возвращает True, если вопрос ещё публично доступен.
         """
-        now = timezone.now()
-        return now <= self.pub_date + datetime.timedelta(days=self.lifespan_days)
+        return timezone.now() <= self.expires_at
+
+    def save(self, *args, **kwargs):
+        # Храним дату истечения в отдельном индексированном поле,
+        # чтобы фильтровать активные/истёкшие вопросы простым сравнением
+        self.expires_at = self.pub_date + datetime.timedelta(days=self.lifespan_days)
+        # Сбрасываем закэшированные свойства, зависящие от дат
+        self.__dict__.pop('is_active', None)
+        self.__dict__.pop('was_published_recently', None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'pub_date', 'lifespan_days'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'expires_at'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.question_text
@@ -47,7 +63,10 @@ class Vote(models.Model):
     choice = models.ForeignKey(Choice, on_delete=models.CASCADE)
 
     class Meta:
-        unique_together = ('user', 'question')
+        unique_together = ('user', 'question') # Уникальный индекс (user, question) покрывает проверку has_voted
+        indexes = [
+            models.Index(fields=['question', 'choice']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} voted for {self.choice.choice_text} in {self.question.question_text}"
\ No newline at end of file
@@ -0,0 +1,13 @@
+# polls/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import bump_questions_version
+from .models import Question
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_index_questions(sender, **kwargs):
+    """
+    Сбрасывает кэш списка вопросов при создании, изменении или удалении вопроса.
+    """
+    bump_questions_version()
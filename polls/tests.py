@@ -1,3 +1,82 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Question, Choice, Vote
+
+
+class QuestionModelTests(TestCase):
+    def test_expires_at_is_derived_on_create(self):
+        question = Question.objects.create(question_text='Вопрос', short_description='Описание', lifespan_days=3)
+        self.assertEqual(question.expires_at, question.pub_date + datetime.timedelta(days=3))
+
+    def test_expires_at_follows_lifespan_days_with_update_fields(self):
+        question = Question.objects.create(question_text='Вопрос', short_description='Описание', lifespan_days=3)
+        question.lifespan_days = 10
+        question.save(update_fields=['lifespan_days'])
+        question.refresh_from_db()
+        self.assertEqual(question.expires_at, question.pub_date + datetime.timedelta(days=10))
+
+
+class VoteViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('voter', password='pw')
+        self.client.force_login(self.user)
+        self.question = Question.objects.create(question_text='Вопрос', short_description='Описание')
+        self.choice = Choice.objects.create(question=self.question, choice_text='Да')
+
+    def vote(self, choice_id):
+        return self.client.post(reverse('polls:vote', args=(self.question.id,)), {'choice': choice_id})
+
+    def test_vote_increments_choice(self):
+        response = self.vote(self.choice.id)
+        self.assertRedirects(response, reverse('polls:results', args=(self.question.id,)))
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.votes, 1)
+        self.assertTrue(Vote.objects.filter(user=self.user, question=self.question, choice=self.choice).exists())
+
+    def test_duplicate_vote_leaves_count_unchanged(self):
+        self.vote(self.choice.id)
+        response = self.vote(self.choice.id)
+        self.assertRedirects(response, reverse('polls:results', args=(self.question.id,)))
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.votes, 1)
+        self.assertEqual(Vote.objects.filter(user=self.user, question=self.question).count(), 1)
+
+    def test_choice_of_another_question_is_rejected(self):
+        other_question = Question.objects.create(question_text='Другой', short_description='Описание')
+        foreign_choice = Choice.objects.create(question=other_question, choice_text='Чужой')
+        response = self.vote(foreign_choice.id)
+        self.assertContains(response, 'Пожалуйста, выберите вариант.')
+        foreign_choice.refresh_from_db()
+        self.assertEqual(foreign_choice.votes, 0)
+        self.assertFalse(Vote.objects.exists())
+
+    def test_missing_choice_is_rejected(self):
+        response = self.vote('')
+        self.assertContains(response, 'Пожалуйста, выберите вариант.')
+        self.assertFalse(Vote.objects.exists())
+
+
+class IndexViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_new_question_appears_right_after_creation(self):
+        Question.objects.create(question_text='Первый', short_description='Описание')
+        response = self.client.get(reverse('polls:index'))
+        self.assertContains(response, 'Первый')
+        # Страница уже в кэше; новый вопрос должен сменить версию кэша
+        Question.objects.create(question_text='Второй', short_description='Описание')
+        response = self.client.get(reverse('polls:index'))
+        self.assertContains(response, 'Второй')
 
-# Create your tests here.
+    def test_expired_question_is_hidden(self):
+        question = Question.objects.create(question_text='Старый', short_description='Описание', lifespan_days=1)
+        question.pub_date -= datetime.timedelta(days=2)
+        question.save()
+        response = self.client.get(reverse('polls:index'))
+        self.assertNotContains(response, 'Старый')
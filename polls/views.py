@@ -8,13 +8,19 @@ from django.contrib import messages
 from django.views import generic
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from django.db import IntegrityError, transaction
+from django.db.models import F, Exists, OuterRef
 from .models import Question, Choice, Vote, UserProfile
+from .cache import INDEX_QUESTIONS_CACHE_KEY, INDEX_QUESTIONS_CACHE_TIMEOUT, get_questions_version
 from .forms import UserRegisterForm, ProfileUpdateForm, QuestionCreateForm, UserUpdateForm, ProfileEditFormSet
 
 class IndexView(generic.ListView):
     template_name = 'polls/index.html'
     context_object_name = 'latest_question_list'
+    paginate_by = 20 # Выводим вопросы постранично
 
     def get_queryset(self):
         """
@@ -22,30 +28,58 @@ class IndexView(generic.ListView):
         Фильтрация происходит на уровне базы данных (эффективно).
         """
         now = timezone.now()
-        # Используем raw SQL через extra для вычисления даты истечения в БД
-        # Это более эффективно, чем фильтрация в Python
-        # Формула: pub_date + lifespan_days дней > now
-        # В SQLite: datetime(pub_date, '+' || lifespan_days || ' days')
-        now_str = now.strftime('%Y-%m-%d %H:%M:%S.%f')
-        return Question.objects.extra(
-            where=["datetime(pub_date, '+' || lifespan_days || ' days') > %s"],
-            params=[now_str]
-        ).order_by('-pub_date')
+        # Дата истечения хранится в индексированном поле expires_at.
+        # QuerySet ленивый: Paginator выполнит его с LIMIT/OFFSET только для нужной страницы.
+        # Загружаем только поля, которые выводит список
+        return Question.objects.only(
+            'id', 'question_text', 'short_description', 'pub_date'
+        ).filter(expires_at__gt=now).order_by('-pub_date')
+
+    @cached_property
+    def questions_version(self):
+        # Версия кэша меняется при каждом изменении вопроса (см. cache.py)
+        return get_questions_version()
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, **kwargs)
+        # Количество вопросов тоже кэшируем, чтобы при попадании в кэш не выполнять COUNT(*)
+        cache_key = f'{INDEX_QUESTIONS_CACHE_KEY}:count'
+        count = cache.get(cache_key, version=self.questions_version)
+        if count is None:
+            cache.set(cache_key, paginator.count, INDEX_QUESTIONS_CACHE_TIMEOUT, version=self.questions_version)
+        else:
+            paginator.count = count # Paginator.count - cached_property, подставляем готовое значение
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Список одинаков для всех пользователей, поэтому кэшируем каждую страницу отдельно:
+        в кэше лежат только вопросы этой страницы.
+        """
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        cache_key = f'{INDEX_QUESTIONS_CACHE_KEY}:page:{page.number}'
+        questions = cache.get(cache_key, version=self.questions_version)
+        if questions is None:
+            questions = list(page.object_list)
+            cache.set(cache_key, questions, INDEX_QUESTIONS_CACHE_TIMEOUT, version=self.questions_version)
+        page.object_list = questions
+        return paginator, page, questions, is_paginated
 
 class DetailView(generic.DetailView):
     model = Question
     template_name = 'polls/detail.html'
 
     def get_queryset(self):
+        # Проверяем, голосовал ли пользователь, подзапросом в том же SELECT, что загружает вопрос
+        if self.request.user.is_authenticated:
+            return Question.objects.annotate(
+                has_voted=Exists(Vote.objects.filter(user=self.request.user, question=OuterRef('pk')))
+            )
         return Question.objects.all()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Проверяем, голосовал ли пользователь
-        if self.request.user.is_authenticated:
-            context['has_voted'] = Vote.objects.filter(user=self.request.user, question=self.object).exists()
-        else:
-            context['has_voted'] = False
+        context['has_voted'] = getattr(self.object, 'has_voted', False)
         return context
 
 class ResultsView(generic.DetailView):
@@ -54,9 +88,13 @@ class ResultsView(generic.DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        total_votes = sum(choice.votes for choice in self.object.choice_set.all())
+        # Загружаем варианты одним запросом и дальше работаем с кэшированным списком
+        choices = list(self.object.choice_set.all())
+        # Сумму считаем по уже загруженному списку: без второго запроса, и проценты
+        # гарантированно согласованы с выведенными голосами
+        total_votes = sum(choice.votes for choice in choices)
         results = []
-        for choice in self.object.choice_set.all():
+        for choice in choices:
             percent = round((choice.votes / total_votes) * 100, 1) if total_votes > 0 else 0
             results.append({'choice': choice, 'percent': percent})
         context['results'] = results
@@ -66,16 +104,36 @@ def vote(request, question_id):
     question = get_object_or_404(Question, pk=question_id)
 
     # Проверяем, активен ли вопрос
-    if not question.is_active():
+    if not question.is_active:
         messages.error(request, "Голосование по этому вопросу завершено.")
         return redirect('polls:index')
 
     if not request.user.is_authenticated:
         return redirect('polls:login')
 
+    # Счётчик и запись Vote меняются в одной транзакции: либо учтено и то и другое, либо ничего.
+    # Счётчик увеличивается одним UPDATE прямо в БД (без предварительного SELECT и гонок при
+    # одновременном голосовании). Фильтр по question заодно проверяет, что вариант принадлежит вопросу.
     try:
-        selected_choice = question.choice_set.get(pk=request.POST['choice'])
-    except (KeyError, Choice.DoesNotExist):
+        choice_id = int(request.POST['choice'])
+    except (KeyError, ValueError):
+        choice_id = None # Вариант не выбран или передан некорректно
+
+    updated = 0
+    if choice_id is not None:
+        try:
+            with transaction.atomic():
+                updated = Choice.objects.filter(question=question, pk=choice_id).update(votes=F('votes') + 1)
+                if updated == 1:
+                    # Уникальность (user, question): если пользователь уже голосовал, база данных
+                    # выбросит IntegrityError, и транзакция откатит увеличение счётчика.
+                    Vote.objects.create(user=request.user, question=question, choice_id=choice_id)
+        except IntegrityError:
+            # Пользователь уже голосовал за этот вопрос
+            messages.warning(request, "Вы уже голосовали в этом опросе.")
+            return redirect('polls:results', pk=question.id)
+
+    if updated != 1:
         return render(request, 'polls/detail.html', {
             'question': question,
             'error_message': 'Пожалуйста, выберите вариант.',
@@ -83,21 +141,7 @@ def vote(request, question_id):
             'has_voted': Vote.objects.filter(user=request.user, question=question).exists() if request.user.is_authenticated else False,
         })
 
-    # Проверяем, уже голосовал ли пользователь, используя уникальность (user, question)
-    # Это делает запись в модели Vote уникальной для каждой пары пользователь-вопрос
-    try:
-        # Пытаемся создать голос. Если запись с таким user и question уже существует (уникальное ограничение),
-        # база данных выбросит IntegrityError.
-        new_vote = Vote.objects.create(user=request.user, question=question, choice=selected_choice)
-        # Если создание прошло успешно, увеличиваем голос у Choice
-        selected_choice.votes += 1
-        selected_choice.save()
-        messages.success(request, "Ваш голос учтён!")
-    except IntegrityError:
-        # Пользователь уже голосовал за этот вопрос
-        messages.warning(request, "Вы уже голосовали в этом опросе.")
-        return redirect('polls:results', pk=question.id)
-
+    messages.success(request, "Ваш голос учтён!")
     return HttpResponseRedirect(reverse('polls:results', args=(question.id,)))
 
 def register(request):
@@ -108,7 +152,7 @@ def register(request):
         form = UserRegisterForm(request.POST, request.FILES)
         if form.is_valid():
             user = form.save()
-            login(request, user)
+            login(request, user, backend='polls.backends.ProfileModelBackend')
             messages.success(request, "Регистрация прошла успешно!")
             return redirect('polls:index')
     else:
@@ -127,14 +171,14 @@ def profile(request):
     # Проверяем, является ли пользователь администратором
     if user.is_staff:
         now = timezone.now()
-        # Используем raw SQL через extra для вычисления даты истечения в БД
-        # для фильтрации истёкших вопросов
-        now_str = now.strftime('%Y-%m-%d %H:%M:%S.%f')
-        expired_questions = Question.objects.extra(
-            where=["datetime(pub_date, '+' || lifespan_days || ' days') <= %s"],
-            params=[now_str]
-        ).order_by('-pub_date')
-        context['expired_questions'] = expired_questions
+        # Истёкшие вопросы: дата истечения уже наступила
+        expired_questions = Question.objects.only(
+            'id', 'question_text', 'pub_date', 'expires_at'
+        ).filter(expires_at__lte=now).order_by('-pub_date')
+        # Истёкших вопросов со временем становится много: выводим их постранично,
+        # в БД уходит запрос с LIMIT/OFFSET только для текущей страницы
+        paginator = Paginator(expired_questions, 20)
+        context['expired_questions'] = paginator.get_page(request.GET.get('page'))
 
     return render(request, 'polls/profile.html', context)
 
@@ -143,14 +187,19 @@ def profile_edit(request):
     """
     Редактирование профиля пользователя.
     """
-    # Получаем профиль пользователя, создавая его, если он не существует
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    # Профиль создаётся при регистрации, поэтому берём его через связь one-to-one
+    # (результат кэшируется на объекте пользователя) и создаём только если его нет
+    try:
+        profile = request.user.profile
+    except UserProfile.DoesNotExist:
+        profile = UserProfile.objects.create(user=request.user)
 
     if request.method == 'POST':
         # Создаём формы с данными из POST и FILES
-        formset = ProfileEditFormSet(user_data=request.POST, profile_data=request.POST, files=request.FILES)
-        # Устанавливаем инстансы для форм
-        formset.set_instances(user_instance=request.user, profile_instance=profile)
+        formset = ProfileEditFormSet(
+            user_instance=request.user, profile_instance=profile,
+            user_data=request.POST, profile_data=request.POST, files=request.FILES
+        )
 
         if formset.is_valid():
             user, profile = formset.save()
@@ -158,8 +207,7 @@ def profile_edit(request):
             return redirect('polls:profile') # Перенаправляем на страницу просмотра профиля
     else:
         # Создаём формы с текущими данными
-        formset = ProfileEditFormSet()
-        formset.set_instances(user_instance=request.user, profile_instance=profile)
+        formset = ProfileEditFormSet(user_instance=request.user, profile_instance=profile)
 
     # Передаём обе формы в шаблон
     context = {
@@ -175,12 +223,7 @@ def profile_delete(request):
     """
     if request.method == 'POST':
         user = request.user
-        # Удаляем профиль (он удаляется каскадно при удалении User, если в модели UserProfile стоит CASCADE)
-        # Но лучше удалить явно, если есть кастомная логика
-        try:
-            user.profile.delete() # Удаляем связанный профиль
-        except UserProfile.DoesNotExist:
-            pass # Профиль уже удалён или не существует (маловероятно, если мы находимся на этой странице)
+        # Профиль удаляется каскадно вместе с User (on_delete=CASCADE в UserProfile)
         user.delete() # Удаляем пользователя
         logout(request) # Важно: выйти из системы, чтобы избежать проблем с сессией
         messages.success(request, "Ваш профиль успешно удалён.")